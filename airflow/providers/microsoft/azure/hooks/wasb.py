@@ -29,7 +29,13 @@ import logging
 import os
 from typing import Any
 
-from azure.core.exceptions import HttpResponseError, ResourceExistsError, ResourceNotFoundError
+from azure.core import MatchConditions
+from azure.core.exceptions import (
+    HttpResponseError,
+    ResourceExistsError,
+    ResourceModifiedError,
+    ResourceNotFoundError,
+)
 from azure.identity import ClientSecretCredential, DefaultAzureCredential
 from azure.storage.blob import BlobClient, BlobServiceClient, ContainerClient, StorageStreamDownloader
 
@@ -347,6 +353,64 @@ class WasbHook(BaseHook):
         blob_client = self._get_blob_client(container_name, blob_name)
         return blob_client.upload_blob(data, blob_type, length=length, **kwargs)
 
+    def append_blob(
+        self,
+        container_name: str,
+        blob_name: str,
+        data: Any,
+        length: int | None = None,
+        chunk_size: int = 4 * 1024 * 1024,
+        create_blob: bool = True,
+        create_container: bool = False,
+        **kwargs,
+    ) -> None:
+        """
+        Appends data to an append blob, creating the blob first if it does not exist yet.
+
+        Only the new data is sent over the wire, the existing content of the blob is never read.
+
+        :param container_name: The name of the container containing the blob
+        :param blob_name: The name of the blob to append to. This need not exist in the container
+        :param data: The data to append. This can be either ``str``, ``bytes`` or a binary
+            file-like object, which is read and appended in chunks of ``chunk_size`` bytes.
+        :param length: Number of bytes to read from the stream. If not set, the stream is
+            read until its end.
+        :param chunk_size: The maximum number of bytes sent with a single ``append_block`` call.
+            Azure does not accept blocks larger than 4 MiB.
+        :param create_blob: Create the append blob if it does not exist yet. Pass False if the
+            blob is known to exist to save a request.
+        :param create_container: Attempt to create the target container prior to uploading the blob. This is
+            useful if the target container may not exist yet. Defaults to False.
+        :param kwargs: Optional keyword arguments that ``BlobClient.append_block()`` takes.
+        """
+        if create_container:
+            self.create_container(container_name)
+
+        blob_client = self._get_blob_client(container_name, blob_name)
+        if create_blob:
+            try:
+                # If-None-Match: * makes the creation a no-op for an already existing blob
+                blob_client.create_append_blob(match_condition=MatchConditions.IfMissing)
+            except (ResourceExistsError, ResourceModifiedError):
+                self.log.debug('Append blob %s already exists in container %s', blob_name, container_name)
+
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if isinstance(data, (bytes, bytearray)):
+            if length is not None:
+                data = data[:length]
+            for offset in range(0, len(data), chunk_size):
+                blob_client.append_block(data[offset : offset + chunk_size], **kwargs)
+            return
+        remaining = length
+        while remaining is None or remaining > 0:
+            chunk = data.read(chunk_size if remaining is None else min(chunk_size, remaining))
+            if not chunk:
+                break
+            blob_client.append_block(chunk, **kwargs)
+            if remaining is not None:
+                remaining -= len(chunk)
+
     def download(
         self, container_name, blob_name, offset: int | None = None, length: int | None = None, **kwargs
     ) -> StorageStreamDownloader:
@@ -17,15 +17,90 @@
 # under the License.
 from __future__ import annotations
 
+import atexit
+import importlib
+import logging
 import os
 import shutil
-
-from azure.common import AzureHttpError
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import IO, TYPE_CHECKING
 
 from airflow.compat.functools import cached_property
 from airflow.configuration import conf
 from airflow.utils.log.file_task_handler import FileTaskHandler
 from airflow.utils.log.logging_mixin import LoggingMixin
+from airflow.utils.state import State
+
+if TYPE_CHECKING:
+    from azure.storage.blob import StorageStreamDownloader
+
+
+class _LazyModule:
+    """Stands in for a module which is only imported once one of its attributes is accessed."""
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    def __getattr__(self, attr: str):
+        return getattr(importlib.import_module(self._name), attr)
+
+
+# The Azure SDK is only needed by processes which actually read or write remote logs,
+# the exceptions are looked up when an error has to be handled.
+_azure_common = _LazyModule('azure.common')
+_azure_core = _LazyModule('azure.core')
+_azure_exceptions = _LazyModule('azure.core.exceptions')
+
+# Logs overwritten as a whole which are larger than the single put size of the client
+# (64 MiB unless ``max_single_put_size`` is set in the connection extra) are uploaded
+# by the SDK as blocks staged with this many parallel requests.
+_UPLOAD_CONCURRENCY = 8
+
+# Number of parallel range requests used to download a large log. The SDK only splits
+# downloads beyond its first 32 MiB range, smaller logs are still fetched at once.
+_DOWNLOAD_CONCURRENCY = 4
+
+# How often merging new logs into a block blob is retried when the blob changes concurrently.
+_MERGE_ATTEMPTS = 3
+
+_hook_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4)
+def _get_wasb_hook(remote_conn_id: str):
+    """
+    Returns a WasbHook shared by all handlers using the same connection, so that
+    they share the connection pool of its BlobServiceClient as well.
+    """
+    from airflow.providers.microsoft.azure.hooks.wasb import WasbHook
+
+    return WasbHook(remote_conn_id)
+
+
+class _UploadWaiter(logging.Handler):
+    """
+    Handler that does not log anything, but blocks in ``close`` until the upload
+    started by the ``WasbTaskHandler`` owning it has finished.
+
+    ``logging.shutdown`` closes handlers in reverse order of creation. The waiter is
+    created right before its task handler, so it is closed right after it and keeps
+    the process alive until the log is uploaded - even when ``logging.shutdown`` is
+    followed by ``os._exit``, which skips ``atexit`` callbacks, as in forked task runners.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.future: Future | None = None
+
+    def emit(self, record) -> None:
+        pass
+
+    def close(self) -> None:
+        if self.future is not None:
+            wait([self.future])
+        super().close()
 
 
 class WasbTaskHandler(FileTaskHandler, LoggingMixin):
@@ -33,8 +108,19 @@ class WasbTaskHandler(FileTaskHandler, LoggingMixin):
     WasbTaskHandler is a python log handler that handles and reads
     task instance logs. It extends airflow FileTaskHandler and
     uploads to and reads from Wasb remote storage.
+
+    The upload happens on a background thread, so closing the handler does not
+    block on network I/O.
+
+    :param no_head_object: If True, the existence of remote logs is never checked with
+        a HEAD request (``get_blob_properties``), which may not be permitted. Logs
+        written by this handler are known to exist, others are probed with a one-byte
+        ranged GET instead.
     """
 
+    _upload_executor: ThreadPoolExecutor | None = None
+    _upload_executor_lock = threading.Lock()
+
     def __init__(
         self,
         base_log_folder: str,
@@ -43,25 +129,33 @@ class WasbTaskHandler(FileTaskHandler, LoggingMixin):
         delete_local_copy: str,
         *,
         filename_template: str | None = None,
+        no_head_object: bool = True,
     ) -> None:
+        # Needs to be created before the handler itself, see _UploadWaiter.
+        self._upload_waiter = _UploadWaiter()
         super().__init__(base_log_folder, filename_template)
         self.wasb_container = wasb_container
         self.remote_base = wasb_log_folder
         self.log_relative_path = ''
+        self._local_loc = ''
+        self._remote_loc = ''
         self._hook = None
         self.closed = False
+        self._close_lock = threading.Lock()
         self.upload_on_close = True
         self.delete_local_copy = delete_local_copy
+        self.no_head_object = no_head_object
+        # remote logs this handler has successfully written to, so they need not be created again
+        self._existing_remote_logs: set[str] = set()
 
     @cached_property
     def hook(self):
         """Returns WasbHook."""
         remote_conn_id = conf.get('logging', 'REMOTE_LOG_CONN_ID')
         try:
-            from airflow.providers.microsoft.azure.hooks.wasb import WasbHook
-
-            return WasbHook(remote_conn_id)
-        except AzureHttpError:
+            with _hook_lock:
+                return _get_wasb_hook(remote_conn_id)
+        except _azure_common.AzureHttpError:
             self.log.exception(
                 'Could not create an WasbHook with connection id "%s".'
                 ' Please make sure that apache-airflow[azure] is installed'
@@ -70,11 +164,24 @@ class WasbTaskHandler(FileTaskHandler, LoggingMixin):
             )
             return None
 
+    @classmethod
+    def _get_upload_executor(cls) -> ThreadPoolExecutor:
+        """Returns the executor shared by all handlers to upload logs in the background."""
+        with cls._upload_executor_lock:
+            if cls._upload_executor is None:
+                cls._upload_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='wasb-log-upload')
+                # make sure pending uploads are flushed when the interpreter exits
+                atexit.register(cls._upload_executor.shutdown, wait=True)
+            return cls._upload_executor
+
     def set_context(self, ti) -> None:
         super().set_context(ti)
         # Local location and remote location is needed to open and
         # upload local log file to Wasb remote storage.
         self.log_relative_path = self._render_filename(ti, ti.try_number)
+        # computed once here rather than on every close
+        self._local_loc = os.path.join(self.local_base, self.log_relative_path)
+        self._remote_loc = self._remote_location(self.log_relative_path)
         self.upload_on_close = not ti.raw
 
     def close(self) -> None:
@@ -83,28 +190,45 @@ class WasbTaskHandler(FileTaskHandler, LoggingMixin):
         # calling close method. Here we check if logger is already
         # closed to prevent uploading the log to remote storage multiple
         # times when `logging.shutdown` is called.
-        if self.closed:
-            return
+        with self._close_lock:
+            if self.closed:
+                return
 
-        super().close()
+            super().close()
 
-        if not self.upload_on_close:
-            return
+            if not self.upload_on_close:
+                return
+
+            local_loc = self._local_loc
+            remote_loc = self._remote_loc
+            try:
+                future = self._get_upload_executor().submit(self._upload_and_cleanup, local_loc, remote_loc)
+            except RuntimeError:
+                # The executor has already been shut down when the handler is
+                # only closed by `logging.shutdown` at interpreter exit.
+                self._upload_and_cleanup(local_loc, remote_loc)
+            else:
+                self._upload_waiter.future = future
+            # Mark closed so we don't double write if close is called twice
+            self.closed = True
 
-        local_loc = os.path.join(self.local_base, self.log_relative_path)
-        remote_loc = os.path.join(self.remote_base, self.log_relative_path)
-        if os.path.exists(local_loc):
-            # read log and remove old logs to get just the latest additions
-            with open(local_loc) as logfile:
-                log = logfile.read()
-            self.wasb_write(log, remote_loc, append=True)
+    def _upload_and_cleanup(self, local_loc: str, remote_loc: str) -> None:
+        """Upload the local log file to remote storage Wasb and remove the local copy if requested."""
+        if not os.path.exists(local_loc):
+            return
+        try:
+            # stream the log straight from disk instead of loading it into memory first
+            with open(local_loc, 'rb') as logfile:
+                uploaded = self.wasb_write(logfile, remote_loc, append=True)
 
-            if self.delete_local_copy:
-                shutil.rmtree(os.path.dirname(local_loc))
-        # Mark closed so we don't double write if close is called twice
-        self.closed = True
+            # the local copy is the only one left if the upload failed
+            if uploaded and self.delete_local_copy:
+                # This already runs on the upload executor, close() does not wait for it.
+                shutil.rmtree(os.path.dirname(local_loc), ignore_errors=True)
+        except Exception:
+            self.log.exception('Failed to upload local log file %s to %s', local_loc, remote_loc)
 
-    def _read(self, ti, try_number: int, metadata: str | None = None) -> tuple[str, dict[str, bool]]:
+    def _read(self, ti, try_number: int, metadata: dict | None = None) -> tuple[str, dict]:
         """
         Read logs of given task instance and try_number from Wasb remote storage.
         If failed, read the log from task instance host machine.
@@ -113,22 +237,73 @@ class WasbTaskHandler(FileTaskHandler, LoggingMixin):
         :param try_number: task instance try_number to read logs from
         :param metadata: log metadata,
                          can be used for steaming log reading and auto-tailing.
+                         While the task is running, ``offset`` in the returned
+                         metadata is the number of bytes read so far, passing it
+                         back only fetches what was appended since.
         """
         # Explicitly getting log relative path is necessary as the given
         # task instance might be different than task instance passed in
         # in set_context method.
         log_relative_path = self._render_filename(ti, try_number)
-        remote_loc = os.path.join(self.remote_base, log_relative_path)
-
-        if self.wasb_log_exists(remote_loc):
-            # If Wasb remote file exists, we do not fetch logs from task instance
-            # local machine even if there are errors reading remote logs, as
-            # returned remote_log will contain error messages.
-            remote_log = self.wasb_read(remote_loc, return_error=True)
-            log = f'*** Reading remote log from {remote_loc}.\n{remote_log}\n'
-            return log, {'end_of_log': True}
-        else:
+        remote_loc = self._remote_location(log_relative_path)
+
+        try:
+            hook = self.hook
+        except Exception as e:
+            # e.g. the connection does not exist, the log is read from the host instead
+            self.log.debug('Exception when trying to create the WasbHook: "%s"', e)
+            hook = None
+        if hook is None:
+            return super()._read(ti, try_number)
+
+        metadata = dict(metadata or {})
+        # An offset returned together with the end of the log belongs to a previous read.
+        # The metadata is passed in by users, an invalid offset reads the whole log.
+        try:
+            offset = 0 if metadata.get('end_of_log') else max(int(metadata.get('offset', 0)), 0)
+        except (TypeError, ValueError):
+            offset = 0
+
+        # The remote log is fetched right away instead of checking for its existence
+        # first, a missing blob is reported by the GET request itself. Only the part
+        # after the offset is transferred when tailing the log of a running task.
+        try:
+            remote_log = self._download(remote_loc, offset=offset or None).readall()
+        except _azure_exceptions.ResourceNotFoundError:
             return super()._read(ti, try_number)
+        except (_azure_common.AzureHttpError, _azure_exceptions.AzureError) as e:
+            # Besides error responses, this covers connection errors and timeouts.
+            if getattr(e, 'status_code', None) != 416:
+                # If Wasb remote file exists, we do not fetch logs from task instance
+                # local machine even if there are errors reading remote logs, as
+                # returned log will contain error messages.
+                self.log.exception('Could not read logs from %s', remote_loc)
+                metadata['end_of_log'] = True
+                return f'*** Could not read logs from {remote_loc}.\n', metadata
+            # Nothing has been appended since the last read
+            remote_log = b''
+
+        metadata['offset'] = str(offset + len(remote_log))
+        # Downloads read the log again until its end without pausing, only the log view
+        # waits between reads and may tail the log of a running try.
+        metadata['end_of_log'] = (
+            bool(metadata.get('download_logs'))
+            or ti.state not in State.unfinished
+            or try_number < ti.try_number
+        )
+        remote_log = remote_log.decode('utf-8', errors='replace')
+        if offset:
+            return remote_log, metadata
+
+        # The possibly large remote log is copied exactly once by joining the parts.
+        log = ''.join((f'*** Reading remote log from {remote_loc}.\n', remote_log, '\n'))
+        return log, metadata
+
+    def _remote_location(self, log_relative_path: str) -> str:
+        """Returns the blob name of a log, blob names are always separated by '/' regardless of the OS."""
+        if not self.remote_base:
+            return log_relative_path
+        return self.remote_base.rstrip('/') + '/' + log_relative_path
 
     def wasb_log_exists(self, remote_log_location: str) -> bool:
         """
@@ -137,6 +312,11 @@ class WasbTaskHandler(FileTaskHandler, LoggingMixin):
         :param remote_log_location: log's location in remote storage
         :return: True if location exists else False
         """
+        if remote_log_location in self._existing_remote_logs:
+            return True
+        if self.no_head_object:
+            return self._probe_with_get(remote_log_location)
+
         try:
             return self.hook.check_for_blob(self.wasb_container, remote_log_location)
 
@@ -144,6 +324,20 @@ class WasbTaskHandler(FileTaskHandler, LoggingMixin):
             self.log.debug('Exception when trying to check remote location: "%s"', e)
         return False
 
+    def _probe_with_get(self, remote_log_location: str) -> bool:
+        """Check if remote_log_location exists by reading its first byte instead of a HEAD request."""
+        try:
+            self.hook.download(self.wasb_container, remote_log_location, offset=0, length=1)
+        except _azure_exceptions.ResourceNotFoundError:
+            return False
+        except _azure_exceptions.HttpResponseError as e:
+            # an empty blob has no first byte to read
+            return e.status_code == 416
+        except Exception as e:
+            self.log.debug('Exception when trying to check remote location: "%s"', e)
+            return False
+        return True
+
     def wasb_read(self, remote_log_location: str, return_error: bool = False):
         """
         Returns the log found at the remote_log_location. Returns '' if no
@@ -155,7 +349,7 @@ class WasbTaskHandler(FileTaskHandler, LoggingMixin):
         """
         try:
             return self.hook.read_file(self.wasb_container, remote_log_location)
-        except AzureHttpError:
+        except _azure_common.AzureHttpError:
             msg = f'Could not read logs from {remote_log_location}'
             self.log.exception(msg)
             # return error if needed
@@ -163,21 +357,111 @@ class WasbTaskHandler(FileTaskHandler, LoggingMixin):
                 return msg
             return ''
 
-    def wasb_write(self, log: str, remote_log_location: str, append: bool = True) -> None:
+    def _download(self, remote_log_location: str, offset: int | None = None) -> StorageStreamDownloader:
+        """
+        Start downloading the log at remote_log_location. Large logs are read with several
+        concurrent range requests, whose threads release the GIL while waiting on the socket.
+        """
+        return self.hook.download(
+            self.wasb_container, remote_log_location, offset=offset, max_concurrency=_DOWNLOAD_CONCURRENCY
+        )
+
+    def wasb_write(self, log: str | IO[bytes], remote_log_location: str, append: bool = True) -> bool:
         """
         Writes the log to the remote_log_location. Fails silently if no hook
         was created.
 
-        :param log: the log to write to the remote_log_location
+        :param log: the log to write to the remote_log_location, either as a string
+            or as a binary file object which is streamed to remote storage without
+            being loaded into memory as a whole.
         :param remote_log_location: the log's location in remote storage
         :param append: if False, any existing log file is overwritten. If True,
             the new log is appended to any existing logs.
+        :return: whether the log was written successfully
         """
-        if append and self.wasb_log_exists(remote_log_location):
-            old_log = self.wasb_read(remote_log_location)
-            log = '\n'.join([old_log, log]) if old_log else log
+        length = None
+        if not isinstance(log, str):
+            # Only what has been written to the file so far is uploaded, even if it keeps growing.
+            start = log.tell()
+            length = os.fstat(log.fileno()).st_size - start
+        if append:
+            try:
+                self.hook.append_blob(
+                    self.wasb_container,
+                    remote_log_location,
+                    log,
+                    length=length,
+                    create_blob=remote_log_location not in self._existing_remote_logs,
+                )
+                self._existing_remote_logs.add(remote_log_location)
+                return True
+            except _azure_exceptions.HttpResponseError as e:
+                # the blob may have been deleted since, it is created again by the next write
+                self._existing_remote_logs.discard(remote_log_location)
+                if e.error_code != 'InvalidBlobType':
+                    self.log.exception('Could not write logs to %s', remote_log_location)
+                    return False
+            # Logs written by earlier versions of this handler are block blobs, which
+            # cannot be appended to, so they still have to be rewritten as a whole.
+            # This is done on bytes to save decoding and re-encoding both logs.
+            if isinstance(log, str):
+                new_log = log.encode('utf-8')
+            else:
+                log.seek(start)
+                new_log = log.read(length)
+            try:
+                return self._merge_into_block_blob(new_log, remote_log_location)
+            except (_azure_common.AzureHttpError, _azure_exceptions.AzureError):
+                self.log.exception('Could not write logs to %s', remote_log_location)
+                return False
 
         try:
-            self.hook.load_string(log, self.wasb_container, remote_log_location, overwrite=True)
-        except AzureHttpError:
+            self._overwrite(log, remote_log_location, length=length)
+        except (_azure_common.AzureHttpError, _azure_exceptions.HttpResponseError):
             self.log.exception('Could not write logs to %s', remote_log_location)
+            return False
+        return True
+
+    def _merge_into_block_blob(self, new_log: bytes, remote_log_location: str) -> bool:
+        """
+        Rewrite the block blob at remote_log_location with new_log appended to it.
+
+        The upload is conditional on the blob being unchanged since it was read (or
+        still missing), so concurrent writers cannot silently drop each other's logs.
+        """
+        for _ in range(_MERGE_ATTEMPTS):
+            try:
+                downloader = self._download(remote_log_location)
+            except _azure_exceptions.ResourceNotFoundError:
+                old_log = b''
+                conditions = {'match_condition': _azure_core.MatchConditions.IfMissing}
+            else:
+                old_log = downloader.readall()
+                conditions = {
+                    'etag': downloader.properties.etag,
+                    'match_condition': _azure_core.MatchConditions.IfNotModified,
+                }
+            log = old_log + b'\n' + new_log if old_log else new_log
+            try:
+                self._overwrite(log, remote_log_location, **conditions)
+                return True
+            except (_azure_exceptions.ResourceModifiedError, _azure_exceptions.ResourceExistsError):
+                self.log.debug('Log %s was modified while merging, retrying', remote_log_location)
+        self.log.error(
+            'Could not write logs to %s, it keeps being modified concurrently', remote_log_location
+        )
+        return False
+
+    def _overwrite(
+        self, log: str | bytes | IO[bytes], remote_log_location: str, length: int | None = None, **kwargs
+    ) -> None:
+        """Upload the log as a block blob replacing any existing one, in parallel blocks if it is large."""
+        self.hook.upload(
+            self.wasb_container,
+            remote_log_location,
+            log,
+            length=length,
+            overwrite=True,
+            max_concurrency=_UPLOAD_CONCURRENCY,
+            **kwargs,
+        )
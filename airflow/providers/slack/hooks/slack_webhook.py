@@ -19,10 +19,45 @@ from __future__ import annotations
 
 import json
 import warnings
+from functools import lru_cache
+from typing import Any
 
+import requests
+from requests.adapters import HTTPAdapter
+from requests_toolbelt.adapters.socket_options import TCPKeepAliveAdapter
+from urllib3.util.retry import Retry
+
+from airflow.compat.functools import cached_property
 from airflow.exceptions import AirflowException
 from airflow.providers.http.hooks.http import HttpHook
 
+# Only rate limited posts (429), which Slack did not process, and posts which could not
+# connect are retried, with exponential backoff honouring Slack's Retry-After header.
+# Other failures may have posted the message already, retrying could post it twice.
+_RETRY = Retry(
+    total=3,
+    connect=3,
+    read=0,
+    status=3,
+    backoff_factor=0.3,
+    status_forcelist=[429],
+    allowed_methods=['POST'],
+    raise_on_status=False,
+)
+
+
+@lru_cache(maxsize=None)
+def _get_adapter(tcp_keep_alive: bool, idle: int, count: int, interval: int) -> HTTPAdapter:
+    """
+    Returns the adapter shared by the sessions of all Slack webhook hooks with the same
+    keep-alive settings, so that posting another message reuses an open TLS connection
+    to Slack instead of creating a new one.
+    """
+    pool_options = {'pool_connections': 16, 'pool_maxsize': 64, 'max_retries': _RETRY}
+    if not tcp_keep_alive:
+        return HTTPAdapter(**pool_options)
+    return TCPKeepAliveAdapter(idle=idle, count=count, interval=interval, **pool_options)
+
 
 class SlackWebhookHook(HttpHook):
     """
@@ -52,6 +87,10 @@ class SlackWebhookHook(HttpHook):
     :param link_names: Whether or not to find and link channel and usernames in your
         message
     :param proxy: Proxy to use to make the Slack webhook call
+
+    All calls of a hook are made through the same ``requests.Session``, whose
+    connection pool is shared with every other Slack webhook hook of the process
+    which uses the same TCP keep-alive settings.
     """
 
     conn_name_attr = 'http_conn_id'
@@ -118,42 +157,149 @@ class SlackWebhookHook(HttpHook):
         else:
             raise AirflowException('Cannot get token: No valid Slack webhook token nor conn_id supplied')
 
-    def _build_slack_message(self) -> str:
+    @cached_property
+    def _session(self) -> requests.Session:
+        """The session used by all calls of this hook, with the shared adapter mounted."""
+        session = self.get_conn()
+        adapter = _get_adapter(
+            self.tcp_keep_alive, self.keep_alive_idle, self.keep_alive_count, self.keep_alive_interval
+        )
+        for prefix in ('https://', 'http://'):
+            session.mount(prefix, adapter)
+        return session
+
+    def run(
+        self,
+        endpoint: str | None = None,
+        data: dict[str, Any] | str | None = None,
+        headers: dict[str, Any] | None = None,
+        extra_options: dict[str, Any] | None = None,
+        **request_kwargs: Any,
+    ) -> Any:
+        r"""
+        Performs the request like ``HttpHook.run``, but reuses the session of the hook
+        instead of creating a new session and keep-alive adapter for every call.
+
+        :param endpoint: the endpoint to be called i.e. resource/v1/query?
+        :param data: payload to be uploaded or request parameters
+        :param headers: additional headers to be sent with this request only
+        :param extra_options: additional options to be used when executing the request
+            i.e. {'check_response': False} to avoid checking raising exceptions on non
+            2XX or 3XX status codes
+        :param request_kwargs: Additional kwargs to pass when creating a request.
+            For example, ``run(json=obj)`` is passed as ``requests.Request(json=obj)``
+        """
+        session = self._session
+        url = self.url_from_endpoint(endpoint)
+        if self.method == 'GET':
+            # GET uses params
+            req = requests.Request(self.method, url, params=data, headers=headers, **request_kwargs)
+        elif self.method == 'HEAD':
+            # HEAD doesn't use params
+            req = requests.Request(self.method, url, headers=headers, **request_kwargs)
+        else:
+            # Others use data
+            req = requests.Request(self.method, url, data=data, headers=headers, **request_kwargs)
+
+        prepped_request = session.prepare_request(req)
+        self.log.info("Sending '%s' to url: %s", self.method, url)
+        return self.run_and_check(session, prepped_request, extra_options or {})
+
+    def _build_slack_message(
+        self,
+        message: str | None = None,
+        attachments: list | None = None,
+        blocks: list | None = None,
+        channel: str | None = None,
+        username: str | None = None,
+        icon_emoji: str | None = None,
+        icon_url: str | None = None,
+        link_names: bool | None = None,
+    ) -> str:
         """
         Construct the Slack message. All relevant parameters are combined here to a valid
-        Slack json message.
+        Slack json message. Parameters which are not given default to the ones of the hook.
 
         :return: Slack message to send
         :rtype: str
         """
         cmd = {}
 
-        if self.channel:
-            cmd['channel'] = self.channel
-        if self.username:
-            cmd['username'] = self.username
-        if self.icon_emoji:
-            cmd['icon_emoji'] = self.icon_emoji
-        if self.icon_url:
-            cmd['icon_url'] = self.icon_url
-        if self.link_names:
+        channel = self.channel if channel is None else channel
+        username = self.username if username is None else username
+        icon_emoji = self.icon_emoji if icon_emoji is None else icon_emoji
+        icon_url = self.icon_url if icon_url is None else icon_url
+        link_names = self.link_names if link_names is None else link_names
+        attachments = self.attachments if attachments is None else attachments
+        blocks = self.blocks if blocks is None else blocks
+
+        if channel:
+            cmd['channel'] = channel
+        if username:
+            cmd['username'] = username
+        if icon_emoji:
+            cmd['icon_emoji'] = icon_emoji
+        if icon_url:
+            cmd['icon_url'] = icon_url
+        if link_names:
             cmd['link_names'] = 1
-        if self.attachments:
-            cmd['attachments'] = self.attachments
-        if self.blocks:
-            cmd['blocks'] = self.blocks
+        if attachments:
+            cmd['attachments'] = attachments
+        if blocks:
+            cmd['blocks'] = blocks
 
-        cmd['text'] = self.message
-        return json.dumps(cmd)
+        text = self.message if message is None else message
+        if text is not None:
+            cmd['text'] = text
+        # Slack ignores whitespace between tokens, there is no need to send it
+        return json.dumps(cmd, separators=(',', ':'))
 
     def execute(self) -> None:
         """Remote Popen (actually execute the slack webhook call)"""
+        self.send()
+
+    def send(
+        self,
+        message: str | None = None,
+        attachments: list | None = None,
+        blocks: list | None = None,
+        channel: str | None = None,
+        username: str | None = None,
+        icon_emoji: str | None = None,
+        icon_url: str | None = None,
+        link_names: bool | None = None,
+    ) -> None:
+        """
+        Post a message to Slack. This allows one hook to send several messages,
+        parameters which are not given default to the ones the hook was created with.
+
+        :param message: The message you want to send on Slack
+        :param attachments: The attachments to send on Slack. Should be a list of
+            dictionaries representing Slack attachments.
+        :param blocks: The blocks to send on Slack. Should be a list of
+            dictionaries representing Slack blocks.
+        :param channel: The channel the message should be posted to
+        :param username: The username to post to slack with
+        :param icon_emoji: The emoji to use as icon for the user posting to Slack
+        :param icon_url: The icon image URL string to use in place of the default icon.
+        :param link_names: Whether or not to find and link channel and usernames in your
+            message
+        """
         proxies = {}
         if self.proxy:
             # we only need https proxy for Slack, as the endpoint is https
             proxies = {'https': self.proxy}
 
-        slack_message = self._build_slack_message()
+        slack_message = self._build_slack_message(
+            message=message,
+            attachments=attachments,
+            blocks=blocks,
+            channel=channel,
+            username=username,
+            icon_emoji=icon_emoji,
+            icon_url=icon_url,
+            link_names=link_names,
+        )
         self.run(
             endpoint=self.webhook_token,
             data=slack_message,
@@ -17,8 +17,9 @@
 # under the License.
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Sequence
+from typing import TYPE_CHECKING, Any, Sequence
 
+from airflow.compat.functools import cached_property
 from airflow.providers.http.operators.http import SimpleHttpOperator
 from airflow.providers.slack.hooks.slack_webhook import SlackWebhookHook
 
@@ -90,21 +91,33 @@ class SlackWebhookOperator(SimpleHttpOperator):
         self.icon_url = icon_url
         self.link_names = link_names
         self.proxy = proxy
-        self.hook: SlackWebhookHook | None = None
+
+    @cached_property
+    def hook(self) -> SlackWebhookHook:
+        """Create and return a SlackWebhookHook bound to the connection (cached)."""
+        return SlackWebhookHook(
+            http_conn_id=self.http_conn_id,
+            webhook_token=self.webhook_token,
+            proxy=self.proxy,
+        )
 
     def execute(self, context: Context) -> None:
         """Call the SlackWebhookHook to post the provided Slack message"""
-        self.hook = SlackWebhookHook(
-            self.http_conn_id,
-            self.webhook_token,
-            self.message,
-            self.attachments,
-            self.blocks,
-            self.channel,
-            self.username,
-            self.icon_emoji,
-            self.icon_url,
-            self.link_names,
-            self.proxy,
-        )
-        self.hook.execute()
+        self.hook.send(**self._message_fields())
+
+    def _message_fields(self) -> dict[str, Any]:
+        """
+        Returns the message fields which are set. This has to be called once templates are
+        rendered, unset fields are left to the defaults of the hook and never serialized.
+        """
+        fields = {
+            'message': self.message,
+            'attachments': self.attachments,
+            'blocks': self.blocks,
+            'channel': self.channel,
+            'username': self.username,
+            'icon_emoji': self.icon_emoji,
+            'icon_url': self.icon_url,
+            'link_names': self.link_names,
+        }
+        return {name: value for name, value in fields.items() if value is not None}